@@ -1,10 +1,8 @@
-from .finnhub_config import FinnHubConfig
-from .llm_config import LLMConfig
+from .config import get_config
 
-__finnhub_config = FinnHubConfig()
-__llm_config = LLMConfig()
+__config = get_config()
 
-finnhub_params = __finnhub_config
-llm_params = __llm_config
+finnhub_params = __config
+llm_params = __config
 
 __all__ = ['finnhub_params', 'llm_params']
\ No newline at end of file
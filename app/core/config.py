@@ -0,0 +1,24 @@
+"Contains the application configuration, read once from the environment."
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    finnhub_api_secret: Optional[str]
+    hugging_face_api_key: Optional[str]
+    repo_id: Optional[str]
+    temperature: float = 0.3
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    "Parses .env on the first call and returns the same Config afterwards."
+    load_dotenv()
+    return Config(finnhub_api_secret=os.getenv('FINNHUB_API_SECRET'),
+                  hugging_face_api_key=os.getenv("HUGGINGFACEHUB_API_TOKEN"),
+                  repo_id=os.getenv("LLM_REPO_ID"))
\ No newline at end of file
@@ -1,11 +1,8 @@
 "Contains configurations for the Finnhub API"
 
-import os 
-from dotenv import load_dotenv
+from .config import get_config
 
 
-load_dotenv() 
-
 class FinnHubConfig: 
     def __init__(self): 
-        self.finnhub_api_secret = os.getenv('FINNHUB_API_SECRET')
\ No newline at end of file
+        self.finnhub_api_secret = get_config().finnhub_api_secret
\ No newline at end of file
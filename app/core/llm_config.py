@@ -1,13 +1,11 @@
 "Contains configurations related to LLM."
 
-import os 
-from dotenv import load_dotenv
+from .config import get_config
 
 
-load_dotenv() 
-
 class LLMConfig: 
     def __init__(self):
-        self.hugging_face_api_key = os.getenv("HUGGINGFACEHUB_API_TOKEN")
-        self.temperature = 0.3
-        self.repo_id = os.getenv("LLM_REPO_ID")
\ No newline at end of file
+        config = get_config()
+        self.hugging_face_api_key = config.hugging_face_api_key
+        self.temperature = config.temperature
+        self.repo_id = config.repo_id
\ No newline at end of file
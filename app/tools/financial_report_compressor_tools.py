@@ -1,10 +1,11 @@
 import datetime
 from typing import List, Dict
 from ..utils import basic_financials
+from ..utils.tool_util import async_tool
 from langchain_core.tools import tool
 
-@tool(name_or_callable='basic_financials')
-def basic_financials_getter(company_symbol: str) -> dict:
+@async_tool(name='basic_financials')
+async def basic_financials_getter(company_symbol: str) -> dict:
     """
     Get the basic financials data for the company. 
 
@@ -14,7 +15,128 @@ def basic_financials_getter(company_symbol: str) -> dict:
     Returns:
         Dictionary containing the financial data
     """
-    return basic_financials(company_symbol=company_symbol)
+    return await basic_financials(company_symbol=company_symbol)
+
+# Category fields of `summarize_finnhub_financials` as (label, metric key, percentage multiplier).
+# A multiplier of None reports the raw metric value instead of a formatted percentage.
+_SUMMARY_SCHEMA = {
+    "valuation": (
+        ("pe_ttm", 'peTTM', None),
+        ("forward_pe", 'forwardPE', None),
+        ("pb_ratio", 'pb', None),
+        ("ps_ratio", 'psTTM', None),
+        ("peg_ratio", 'pegTTM', None),
+        ("ev_ebitda", 'evEbitdaTTM', None),
+        ("market_cap", 'marketCapitalization', None),
+        ("enterprise_value", 'enterpriseValue', None),
+    ),
+    "profitability": (
+        ("eps_ttm", 'epsTTM', None),
+        ("eps_growth_ttm_yoy", 'epsGrowthTTMYoy', 1),
+        ("eps_growth_3y", 'epsGrowth3Y', 1),
+        ("net_margin_ttm", 'netProfitMarginTTM', 100),
+        ("operating_margin_ttm", 'operatingMarginTTM', 100),
+        ("gross_margin_ttm", 'grossMarginTTM', 100),
+        ("roe_ttm", 'roeTTM', 100),
+        ("roa_ttm", 'roaTTM', 100),
+        ("roic_ttm", 'roiTTM', 100),
+    ),
+    "liquidity": (
+        ("current_ratio", 'currentRatioQuarterly', None),
+        ("quick_ratio", 'quickRatioQuarterly', None),
+        ("cash_per_share", 'cashPerSharePerShareQuarterly', None),
+    ),
+    "leverage": (
+        ("debt_to_equity", 'totalDebt/totalEquityQuarterly', None),
+        ("long_term_debt_to_equity", 'longTermDebt/equityQuarterly', None),
+        ("debt_to_assets", 'totalDebtToTotalAsset', None),
+        ("interest_coverage", 'netInterestCoverageTTM', None),
+    ),
+    "efficiency": (
+        ("asset_turnover_ttm", 'assetTurnoverTTM', None),
+        ("inventory_turnover_ttm", 'inventoryTurnoverTTM', None),
+        ("receivables_turnover_ttm", 'receivablesTurnoverTTM', None),
+        ("cash_flow_per_share_ttm", 'cashFlowPerShareTTM', None),
+    ),
+    "performance": (
+        ("revenue_growth_ttm_yoy", 'revenueGrowthTTMYoy', 1),
+        ("revenue_growth_3y", 'revenueGrowth3Y', 1),
+        ("revenue_per_share_ttm", 'revenuePerShareTTM', None),
+        ("dividend_yield", 'currentDividendYieldTTM', 100),
+    ),
+    "stock_performance": (
+        ("52_week_high", '52WeekHigh', None),
+        ("52_week_low", '52WeekLow', None),
+        ("52_week_return", '52WeekPriceReturnDaily', 1),
+        ("ytd_return", 'yearToDatePriceReturnDaily', 1),
+        ("beta", 'beta', None),
+        ("vs_sp500_52week", 'priceRelativeToS&P50052Week', 1),
+        ("vs_sp500_ytd", 'priceRelativeToS&P500Ytd', 1),
+    ),
+}
+
+# Every metric read by `summarize_finnhub_financials`, fetched once per call
+_SUMMARY_METRIC_KEYS = tuple(dict.fromkeys(
+    [key for fields in _SUMMARY_SCHEMA.values() for _, key, _ in fields] + ['netMarginGrowth5Y']
+))
+
+# Raw metrics the red flags, highlights and assessments read besides the categories
+_SUMMARY_CHECK_KEYS = (
+    'netProfitMarginTTM', 'netMarginGrowth5Y', 'currentRatioQuarterly', 'totalDebt/totalEquityQuarterly',
+    'epsGrowthTTMYoy', 'quickRatioQuarterly', 'roeTTM', 'revenueGrowthTTMYoy',
+)
+
+_PCT = "{:.2f}%".format
+
+def _format_pct(value, multiplier=1):
+    "Formats the value as a percentage with two decimals, 'N/A' when missing."
+    return _PCT(value * multiplier) if value is not None else "N/A"
+
+def _render_summary_builder() -> str:
+    """
+    Renders the source of `_summarize_metrics(metric)`, a straight-line specialization of
+    `_SUMMARY_SCHEMA`: it fetches every metric once into a local, builds the category dicts
+    literally with inlined percentage formatting and returns them along with the raw
+    values of `_SUMMARY_CHECK_KEYS`.
+    """
+    local = {key: f"v{index}" for index, key in enumerate(_SUMMARY_METRIC_KEYS)}
+    lines = [
+        "def _summarize_metrics(metric):",
+        "    get = metric.get",
+        f"    {', '.join(local.values())}, = {', '.join(f'get({key!r})' for key in _SUMMARY_METRIC_KEYS)}",
+        "    categories = {",
+    ]
+    for category, fields in _SUMMARY_SCHEMA.items():
+        lines.append(f"        {category!r}: {{")
+        for label, key, multiplier in fields:
+            value = local[key]
+            if multiplier is not None:
+                scaled = value if multiplier == 1 else f"{value} * {multiplier!r}"
+                value = f"(_PCT({scaled}) if {value} is not None else 'N/A')"
+            lines.append(f"            {label!r}: {value},")
+        lines.append("        },")
+    lines.append("    }")
+    lines.append(f"    return categories, ({', '.join(local[key] for key in _SUMMARY_CHECK_KEYS)},)")
+    return "\n".join(lines)
+
+_namespace = {'_PCT': _PCT}
+exec(compile(_render_summary_builder(), '<generated _summarize_metrics>', 'exec'), _namespace)
+_summarize_metrics = _namespace['_summarize_metrics']
+del _namespace
+
+def _get_trend(current, growth):
+    "Helper to identify trends"
+    if growth is None or current is None:
+        return "stable"
+    if growth > 10:
+        return "strong growth"
+    elif growth > 5:
+        return "moderate growth"
+    elif growth < -10:
+        return "declining"
+    elif growth < 0:
+        return "slight decline"
+    return "stable"
 
 @tool
 def summarize_finnhub_financials(data:dict):
@@ -48,149 +170,67 @@ def summarize_finnhub_financials(data:dict):
     symbol = data.get('symbol', 'UNKNOWN')
     series = data.get('series', {})
 
-    # Helper function to safely get metric values
-    def get_metric(key, default=None):
-        return metric.get(key, default)
-
-    # Helper to format percentages
-    def format_pct(value, multiplier=1):
-        if value is None:
-            return "N/A"
-        return f"{value * multiplier:.2f}%"
-
-    # Helper to identify trends
-    def get_trend(current, growth):
-        if growth is None or current is None:
-            return "stable"
-        if growth > 10:
-            return "strong growth"
-        elif growth > 5:
-            return "moderate growth"
-        elif growth < -10:
-            return "declining"
-        elif growth < 0:
-            return "slight decline"
-        return "stable"
+    # 1-7. CATEGORY METRICS, every metric is looked up exactly once
+    categories, (net_margin, net_margin_growth, current_ratio, _debt_to_equity,
+                 eps_yoy, quick_ratio, roe, revenue_yoy) = _summarize_metrics(metric)
+    profitability = categories["profitability"]
+    liquidity = categories["liquidity"]
+    leverage = categories["leverage"]
 
-    # 1. VALUATION METRICS
-    valuation = {
-        "pe_ttm": get_metric('peTTM'),
-        "forward_pe": get_metric('forwardPE'),
-        "pb_ratio": get_metric('pb'),
-        "ps_ratio": get_metric('psTTM'),
-        "peg_ratio": get_metric('pegTTM'),
-        "ev_ebitda": get_metric('evEbitdaTTM'),
-        "market_cap": get_metric('marketCapitalization'),
-        "enterprise_value": get_metric('enterpriseValue')
-    }
+    profitability["trend"] = _get_trend(net_margin, net_margin_growth)
 
-    # 2. PROFITABILITY METRICS
-    profitability = {
-        "eps_ttm": get_metric('epsTTM'),
-        "eps_growth_ttm_yoy": format_pct(get_metric('epsGrowthTTMYoy')),
-        "eps_growth_3y": format_pct(get_metric('epsGrowth3Y')),
-        "net_margin_ttm": format_pct(get_metric('netProfitMarginTTM'), 100),
-        "operating_margin_ttm": format_pct(get_metric('operatingMarginTTM'), 100),
-        "gross_margin_ttm": format_pct(get_metric('grossMarginTTM'), 100),
-        "roe_ttm": format_pct(get_metric('roeTTM'), 100),
-        "roa_ttm": format_pct(get_metric('roaTTM'), 100),
-        "roic_ttm": format_pct(get_metric('roiTTM'), 100),
-        "trend": get_trend(get_metric('netProfitMarginTTM'), get_metric('netMarginGrowth5Y'))
-    }
-
-    # 3. LIQUIDITY METRICS
-    # Extract nested conditional into a separate statement for clarity and to satisfy linters
-    _wc_ratio = get_metric('currentRatioQuarterly', 0)
-    if _wc_ratio > 1.5:
-        _working_capital_status = "healthy"
-    elif _wc_ratio > 1.0:
-        _working_capital_status = "adequate"
+    # Missing metrics never pass a threshold check, matching the old lookup defaults
+    if current_ratio is not None and current_ratio > 1.5:
+        liquidity["working_capital_status"] = "healthy"
+    elif current_ratio is not None and current_ratio > 1.0:
+        liquidity["working_capital_status"] = "adequate"
     else:
-        _working_capital_status = "tight"
-
-    liquidity = {
-        "current_ratio": get_metric('currentRatioQuarterly'),
-        "quick_ratio": get_metric('quickRatioQuarterly'),
-        "cash_per_share": get_metric('cashPerSharePerShareQuarterly'),
-        "working_capital_status": _working_capital_status
-    }
+        liquidity["working_capital_status"] = "tight"
 
-    # 4. LEVERAGE/SOLVENCY METRICS
-    _debt_to_equity = get_metric('totalDebt/totalEquityQuarterly', 0)
-    if _debt_to_equity > 2.0:
-        _leverage_assessment = "high"
-    elif _debt_to_equity > 1.0:
-        _leverage_assessment = "moderate"
+    if _debt_to_equity is not None and _debt_to_equity > 2.0:
+        leverage["leverage_assessment"] = "high"
+    elif _debt_to_equity is not None and _debt_to_equity > 1.0:
+        leverage["leverage_assessment"] = "moderate"
     else:
-        _leverage_assessment = "low"
-
-    leverage = {
-        "debt_to_equity": get_metric('totalDebt/totalEquityQuarterly'),
-        "long_term_debt_to_equity": get_metric('longTermDebt/equityQuarterly'),
-        "debt_to_assets": get_metric('totalDebtToTotalAsset'),
-        "interest_coverage": get_metric('netInterestCoverageTTM'),
-        "leverage_assessment": _leverage_assessment
-    }
-
-    # 5. EFFICIENCY METRICS
-    efficiency = {
-        "asset_turnover_ttm": get_metric('assetTurnoverTTM'),
-        "inventory_turnover_ttm": get_metric('inventoryTurnoverTTM'),
-        "receivables_turnover_ttm": get_metric('receivablesTurnoverTTM'),
-        "cash_flow_per_share_ttm": get_metric('cashFlowPerShareTTM')
-    }
-
-    # 6. PERFORMANCE TRENDS
-    performance = {
-        "revenue_growth_ttm_yoy": format_pct(get_metric('revenueGrowthTTMYoy')),
-        "revenue_growth_3y": format_pct(get_metric('revenueGrowth3Y')),
-        "revenue_per_share_ttm": get_metric('revenuePerShareTTM'),
-        "dividend_yield": format_pct(get_metric('currentDividendYieldTTM'), 100)
-    }
-
-    # 7. STOCK PERFORMANCE
-    stock_performance = {
-        "52_week_high": get_metric('52WeekHigh'),
-        "52_week_low": get_metric('52WeekLow'),
-        "52_week_return": format_pct(get_metric('52WeekPriceReturnDaily')),
-        "ytd_return": format_pct(get_metric('yearToDatePriceReturnDaily')),
-        "beta": get_metric('beta'),
-        "vs_sp500_52week": format_pct(get_metric('priceRelativeToS&P50052Week')),
-        "vs_sp500_ytd": format_pct(get_metric('priceRelativeToS&P500Ytd'))
-    }
+        leverage["leverage_assessment"] = "low"
 
     # 8. RED FLAGS & KEY HIGHLIGHTS
     red_flags = []
     highlights = []
 
+    # Percentages shared with the messages below were formatted with the categories
+    eps_yoy_pct = profitability["eps_growth_ttm_yoy"]
+    roe_pct = profitability["roe_ttm"]
+    revenue_yoy_pct = categories["performance"]["revenue_growth_ttm_yoy"]
+
     # Check for red flags
-    if get_metric('currentRatioQuarterly', 2) < 1.0:
+    if current_ratio is not None and current_ratio < 1.0:
         red_flags.append("Liquidity concern: Current ratio below 1.0")
 
-    if get_metric('totalDebt/totalEquityQuarterly', 0) > 2.0:
+    if _debt_to_equity is not None and _debt_to_equity > 2.0:
         red_flags.append("High leverage: Debt-to-equity above 2.0")
 
-    if get_metric('netProfitMarginTTM', 0) < 0:
+    if net_margin is not None and net_margin < 0:
         red_flags.append("Unprofitable: Negative net margin")
 
-    if get_metric('epsGrowthTTMYoy', 0) < -20:
-        red_flags.append(f"Significant EPS decline: {format_pct(get_metric('epsGrowthTTMYoy'))}")
+    if eps_yoy is not None and eps_yoy < -20:
+        red_flags.append(f"Significant EPS decline: {eps_yoy_pct}")
 
-    if get_metric('quickRatioQuarterly', 2) < 0.5:
+    if quick_ratio is not None and quick_ratio < 0.5:
         red_flags.append("Very low quick ratio: May struggle with short-term obligations")
 
     # Check for highlights
-    if get_metric('epsGrowthTTMYoy', 0) > 20:
-        highlights.append(f"Strong EPS growth: {format_pct(get_metric('epsGrowthTTMYoy'))} YoY")
+    if eps_yoy is not None and eps_yoy > 20:
+        highlights.append(f"Strong EPS growth: {eps_yoy_pct} YoY")
 
-    if get_metric('roeTTM', 0) > 0.20:
-        highlights.append(f"Excellent ROE: {format_pct(get_metric('roeTTM'), 100)}")
+    if roe is not None and roe > 0.20:
+        highlights.append(f"Excellent ROE: {roe_pct}")
 
-    if get_metric('currentRatioQuarterly', 0) > 2.0:
+    if current_ratio is not None and current_ratio > 2.0:
         highlights.append("Strong liquidity position")
 
-    if get_metric('revenueGrowthTTMYoy', 0) > 15:
-        highlights.append(f"High revenue growth: {format_pct(get_metric('revenueGrowthTTMYoy'))}")
+    if revenue_yoy is not None and revenue_yoy > 15:
+        highlights.append(f"High revenue growth: {revenue_yoy_pct}")
 
     # 9. MOST RECENT QUARTERLY TREND (from series data)
     quarterly_trend = {}
@@ -199,7 +239,7 @@ def summarize_finnhub_financials(data:dict):
         if len(recent_eps) >= 2:
             quarterly_trend['latest_quarter_eps'] = recent_eps[0]['v']
             quarterly_trend['prior_quarter_eps'] = recent_eps[1]['v']
-            quarterly_trend['eps_qoq_change'] = format_pct(
+            quarterly_trend['eps_qoq_change'] = _format_pct(
                 ((recent_eps[0]['v'] - recent_eps[1]['v']) / abs(recent_eps[1]['v']) * 100) 
                 if recent_eps[1]['v'] != 0 else 0, 1
             )
@@ -208,13 +248,7 @@ def summarize_finnhub_financials(data:dict):
     summary = {
         "company": symbol.upper(),
         "snapshot_date": "Latest Available",
-        "valuation": valuation,
-        "profitability": profitability,
-        "liquidity": liquidity,
-        "leverage": leverage,
-        "efficiency": efficiency,
-        "performance": performance,
-        "stock_performance": stock_performance,
+        **categories,
         "quarterly_trend": quarterly_trend,
         "highlights": highlights if highlights else ["None identified"],
         "red_flags": red_flags if red_flags else ["None identified"],
@@ -231,33 +265,43 @@ def _assess_overall_health(metric):
     score = 0
 
     # Profitability check
-    if metric.get('netProfitMarginTTM', 0) > 0.10:
+    value = metric.get('netProfitMarginTTM')
+    value = 0 if value is None else value
+    if value > 0.10:
         score += 2
-    elif metric.get('netProfitMarginTTM', 0) > 0:
+    elif value > 0:
         score += 1
 
     # Liquidity check
-    if metric.get('currentRatioQuarterly', 0) > 1.5:
+    value = metric.get('currentRatioQuarterly')
+    value = 0 if value is None else value
+    if value > 1.5:
         score += 2
-    elif metric.get('currentRatioQuarterly', 0) > 1.0:
+    elif value > 1.0:
         score += 1
 
     # Leverage check
-    if metric.get('totalDebt/totalEquityQuarterly', 3) < 1.0:
+    value = metric.get('totalDebt/totalEquityQuarterly')
+    value = 3 if value is None else value
+    if value < 1.0:
         score += 2
-    elif metric.get('totalDebt/totalEquityQuarterly', 3) < 2.0:
+    elif value < 2.0:
         score += 1
 
     # Growth check
-    if metric.get('epsGrowthTTMYoy', -100) > 10:
+    value = metric.get('epsGrowthTTMYoy')
+    value = -100 if value is None else value
+    if value > 10:
         score += 2
-    elif metric.get('epsGrowthTTMYoy', -100) > 0:
+    elif value > 0:
         score += 1
 
     # ROE check
-    if metric.get('roeTTM', 0) > 0.15:
+    value = metric.get('roeTTM')
+    value = 0 if value is None else value
+    if value > 0.15:
         score += 2
-    elif metric.get('roeTTM', 0) > 0.10:
+    elif value > 0.10:
         score += 1
 
     if score >= 8:
@@ -1,24 +1,25 @@
 import datetime
 from typing import List, Dict
-from ..utils import peers_retrieval, list_ipos, company_news
-from langchain_core.tools import tool
+from ..utils import peers_retrieval, list_ipos
+from ..utils import company_news as news_retrieval
+from ..utils.tool_util import async_tool
 
-@tool
-def get_peers(company_symbol: str) -> List[str]:
+@async_tool
+async def get_peers(company_symbols: List[str]) -> Dict[str, List[str]]:
     """
     Get the peer organizations which operates in the same niche.
 
     Args: 
-        company_symbol(str): Symbol by which company is listed in the exchange.
+        company_symbols(List[str]): Symbols by which companies are listed in the exchange.
 
     Returns: 
-        List containing symbols of peer companies.
+        Dictionary mapping each company symbol to the symbols of its peer companies.
     """
-    return peers_retrieval(company_symbol=company_symbol)
+    return await peers_retrieval(company_symbols=company_symbols)
 
 
-@tool
-def ipos_lister(from_date: datetime, to_date: datetime) -> List[Dict] :
+@async_tool
+async def ipos_lister(from_date: datetime, to_date: datetime) -> List[Dict] :
     """
     Lists the IPOs that got listed in the given time-frame.
 
@@ -30,11 +31,11 @@ def ipos_lister(from_date: datetime, to_date: datetime) -> List[Dict] :
     Returns: 
         List of dictionaries, each dictionary containing data for each IPO.
     """
-    return list_ipos(begin_date=from_date,
-                     end_date=to_date)
+    return await list_ipos(begin_date=from_date,
+                           end_date=to_date)
 
-@tool
-def company_news(company_symbol:str, from_date: datetime, to_date: datetime) -> List[Dict]:
+@async_tool
+async def company_news(company_symbol:str, from_date: datetime, to_date: datetime) -> List[Dict]:
     """
     Gets the comapny news between the given time interval
 
@@ -46,6 +47,6 @@ def company_news(company_symbol:str, from_date: datetime, to_date: datetime) ->
     Returns:
         List of dictionaries each containing data to access the unique news article.
     """
-    return company_news(company_symbol=company_symbol,
-                        from_date=from_date,
-                        to_date=to_date)
\ No newline at end of file
+    return await news_retrieval(company_symbol=company_symbol,
+                                begin_date=from_date,
+                                end_date=to_date)
\ No newline at end of file
@@ -1,41 +1,109 @@
+import asyncio
+import codecs
 import aiohttp
-from bs4 import BeautifulSoup
+from types import MappingProxyType
+from typing import List
+from selectolax.lexbor import LexborHTMLParser
 from langchain_core.tools import tool
 from langchain.tools import ToolRuntime
+from ..utils.session_util import LoopBoundSession
 
 
+# Realistic browser headers to avoid 403 errors, shared read-only between requests.
+_HEADERS = MappingProxyType({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Cache-Control': 'max-age=0',
+})
+
+# Articles only need the title and visible text; we stop reading pages past this size.
+_MAX_HTML_BYTES = 512 * 1024
+_CHUNK_SIZE = 64 * 1024
+_CONTENT_END_TAGS = (b'</article>', b'</main>')
+# Inline code and styling is not article text, it is dropped before extracting the text
+_NON_CONTENT_TAGS = ['script', 'style', 'noscript']
+
+def _new_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(resolver=aiohttp.AsyncResolver(), use_dns_cache=True,
+                                       ttl_dns_cache=600, limit=64, keepalive_timeout=75),
+        timeout=aiohttp.ClientTimeout(total=20),
+        auto_decompress=True,
+    )
+
+
+# Shared across calls, with one session per running event loop
+_SESSION = LoopBoundSession(_new_session)
+
+
+async def close_session():
+    """
+    Close the shared session, to be awaited on application shutdown.
+    """
+    await _SESSION.close()
+
+
+def _charset(response: aiohttp.ClientResponse) -> str:
+    "The declared charset when Python knows it, else utf-8 (e.g. for 'utf8mb4')."
+    try:
+        return codecs.lookup(response.charset or 'utf-8').name
+    except LookupError:
+        return 'utf-8'
+
+
+async def _read_capped(response: aiohttp.ClientResponse) -> str:
+    """
+    Read at most `_MAX_HTML_BYTES` of the (decompressed) body. A truncated page is
+    cut after its last closing article/main tag when there is one.
+    """
+    buf = bytearray()
+    async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+        buf.extend(chunk)
+        if len(buf) > _MAX_HTML_BYTES:
+            del buf[_MAX_HTML_BYTES:]
+            for end_tag in _CONTENT_END_TAGS:
+                end = buf.rfind(end_tag)
+                if end != -1:
+                    del buf[end + len(end_tag):]
+                    break
+            break
+    return buf.decode(_charset(response), errors='replace')
 
 
 async def read_redirected_content(url: str) -> dict:
     """
     Scrape with realistic browser headers to avoid 403 errors.
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate',
-        'DNT': '1',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-        'Sec-Fetch-Dest': 'document',
-        'Sec-Fetch-Mode': 'navigate',
-        'Sec-Fetch-Site': 'none',
-        'Cache-Control': 'max-age=0',
-    }
-    
     try:
-        async with aiohttp.ClientSession(auto_decompress=True) as session:
-            async with session.get(url, headers=headers, allow_redirects=True) as response:
-                
-                # final_url = str(response.url)
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                return {
-                    'title': soup.title.string if soup.title else 'No title',
-                    'content': soup.get_text(separator="\n", strip=True)                
-                    }
-                
+        session = await _SESSION.get()
+        async with session.get(url, headers=_HEADERS, allow_redirects=True) as response:
+
+            # final_url = str(response.url)
+            html = await _read_capped(response)
+            tree = LexborHTMLParser(html)
+            tree.strip_tags(_NON_CONTENT_TAGS)
+            title = tree.css_first('title')
+            body = tree.body
+            return {
+                'title': title.text() if title else 'No title',
+                'content': body.text(separator="\n", strip=True) if body else ''
+                }
+
     except Exception as e:
         print(f"Error: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+async def read_redirected_contents(urls: List[str]) -> List[dict]:
+    """
+    Scrape several URLs concurrently over the shared connection pool.
+    """
+    return await asyncio.gather(*[read_redirected_content(url) for url in urls])
@@ -1,11 +1,12 @@
-from .finnhub_util import FinnHub
+from .finnhub_util import AsyncFinnHub
+from .session_util import close_sessions
 
-__finnhub_obj = FinnHub()
+__finnhub_obj = AsyncFinnHub()
 
-peers_retrieval = __finnhub_obj.get_peers
+peers_retrieval = __finnhub_obj.get_peers_for_all
 list_ipos = __finnhub_obj.get_upcoming_ipos
 basic_financials = __finnhub_obj.get_basic_financials
 company_news = __finnhub_obj.get_company_news
 
 
-__all__ = ['peers_retrieval', 'list_ipos', 'basic_financials', 'company_news']
\ No newline at end of file
+__all__ = ['peers_retrieval', 'list_ipos', 'basic_financials', 'company_news', 'close_sessions']
\ No newline at end of file
@@ -1,3 +1,97 @@
+import re
+from functools import lru_cache
+import string
+
+
+def _format_series(series: list, periods: int) -> str:
+    """Format the latest `periods` values of a series oldest-first, e.g. '1.20 → 1.35 → 1.52'."""
+    return ' → '.join([f"{item['v']:.2f}" for item in reversed(series[:periods])])
+
+
+# Metrics of `create_comprehensive_summary` as placeholder -> (metric key, multiplier, decimals, suffix)
+_SUMMARY_FIELDS = {
+    'pe': ('peTTM', 1, 2, ''),
+    'forward_pe': ('forwardPE', 1, 2, ''),
+    'peg': ('pegTTM', 1, 2, ''),
+    'pb': ('pb', 1, 2, ''),
+    'pb_annual': ('pbAnnual', 1, 2, ''),
+    'ps': ('psTTM', 1, 2, ''),
+    'ev_ebitda': ('evEbitdaTTM', 1, 2, ''),
+    'pfcf': ('pfcfShareTTM', 1, 2, ''),
+    'eps': ('epsTTM', 1, 2, ''),
+    'eps_yoy': ('epsGrowthTTMYoy', 100, 1, '%'),
+    'eps_3y': ('epsGrowth3Y', 100, 1, '%'),
+    'eps_5y': ('epsGrowth5Y', 100, 1, '%'),
+    'roe': ('roeTTM', 100, 1, '%'),
+    'roa': ('roaTTM', 100, 1, '%'),
+    'gross_margin': ('grossMarginTTM', 100, 1, '%'),
+    'op_margin': ('operatingMarginTTM', 100, 1, '%'),
+    'pretax_margin': ('pretaxMarginTTM', 100, 1, '%'),
+    'net_margin': ('netProfitMarginTTM', 100, 1, '%'),
+    'revenue_yoy': ('revenueGrowthTTMYoy', 100, 1, '%'),
+    'revenue_3y': ('revenueGrowth3Y', 100, 1, '%'),
+    'revenue_5y': ('revenueGrowth5Y', 100, 1, '%'),
+    'debt_to_equity': ('totalDebt/totalEquityQuarterly', 1, 2, ''),
+    'current_ratio': ('currentRatioQuarterly', 1, 2, ''),
+    'quick_ratio': ('quickRatioQuarterly', 1, 2, ''),
+    'cash_per_share': ('cashPerSharePerShareQuarterly', 1, 2, ''),
+    'cash_flow_per_share': ('cashFlowPerShareTTM', 1, 2, ''),
+    'fcf_cagr_5y': ('focfCagr5Y', 100, 1, '%'),
+    'ytd_return': ('yearToDatePriceReturnDaily', 100, 1, '%'),
+    '52w_return': ('52WeekPriceReturnDaily', 100, 1, '%'),
+    'vs_sp500': ('priceRelativeToS&P50052Week', 100, 1, '%'),
+    'beta': ('beta', 1, 2, ''),
+    '52w_high': ('52WeekHigh', 1, 2, ''),
+    '52w_low': ('52WeekLow', 1, 2, ''),
+    'asset_turnover': ('assetTurnoverTTM', 1, 2, ''),
+    'inventory_turnover': ('inventoryTurnoverTTM', 1, 2, ''),
+    'receivables_turnover': ('receivablesTurnoverTTM', 1, 2, ''),
+    'dividend_yield': ('currentDividendYieldTTM', 100, 2, '%'),
+    'payout_ratio': ('payoutRatioTTM', 100, 1, '%'),
+    'dps': ('dividendPerShareTTM', 1, 2, ''),
+}
+
+_BRIEF_TEMPLATE = "PE {pe} (PEG {peg}), EPS ${eps} ({eps_yoy} YoY), ROE {roe}, D/E {debt_to_equity}, YTD {ytd_return}"
+
+_STANDARD_SECTIONS = (
+    "VALUATION: PE {pe} (Fwd {forward_pe}), PEG {peg}, P/B {pb}, P/S {ps}, EV/EBITDA {ev_ebitda}",
+    "PROFITABILITY: EPS ${eps} ({eps_yoy} YoY), ROE {roe}, ROA {roa}, Net Margin {net_margin}, Op Margin {op_margin}",
+    "GROWTH: Revenue {revenue_yoy} YoY, 3Y {revenue_3y}, 5Y {revenue_5y}, EPS 3Y {eps_3y}, 5Y {eps_5y}",
+    "HEALTH: D/E {debt_to_equity}, Current {current_ratio}, Quick {quick_ratio}, Cash/Share ${cash_per_share}",
+    "PERFORMANCE: YTD {ytd_return}, 52W {52w_return}, vs S&P {vs_sp500}, Beta {beta}",
+)
+
+_DETAILED_SECTIONS = (
+    "CASH FLOW: FCF/Share ${cash_flow_per_share}, FCF Margin {fcf_cagr_5y} (5Y CAGR), P/FCF {pfcf}",
+    "MARGINS: Gross {gross_margin}, Operating {op_margin}, Pretax {pretax_margin}, Net {net_margin}",
+    "EFFICIENCY: Asset Turnover {asset_turnover}, Inventory Turnover {inventory_turnover}, Receivables Turnover {receivables_turnover}",
+)
+
+_DIVIDEND_SECTION = "DIVIDEND: Yield {dividend_yield}, Payout Ratio {payout_ratio}, DPS ${dps}"
+
+_PRICE_RANGE_SECTION = "PRICE RANGE: 52W High ${52w_high}, Low ${52w_low}, Current P/B {pb} vs Annual P/B {pb_annual}"
+
+
+def _template_fields(*templates: str) -> tuple:
+    """Schema entries (name, key, mult, dec, suf) for the placeholders used by the templates."""
+    names = dict.fromkeys(name for template in templates
+                          for _, name, _, _ in string.Formatter().parse(template) if name)
+    return tuple((name, *_SUMMARY_FIELDS[name]) for name in names)
+
+
+_BRIEF_FIELDS = _template_fields(_BRIEF_TEMPLATE)
+_DETAILED_FIELDS = _template_fields(*_STANDARD_SECTIONS, *_DETAILED_SECTIONS,
+                                    _DIVIDEND_SECTION, _PRICE_RANGE_SECTION)
+_LEVEL_FIELDS = {
+    'brief': _BRIEF_FIELDS,
+    'standard': _template_fields(*_STANDARD_SECTIONS),
+}
+
+
+def _format_metric(val, mult=1, dec=2, suf=''):
+    return f"{float(val)*mult:.{dec}f}{suf}" if val is not None else 'N/A'
+
+
 def create_comprehensive_summary(data: dict, detail_level: str = 'standard') -> str:
     """
     Flexible summary with three detail levels:
@@ -14,60 +108,37 @@ def create_comprehensive_summary(data: dict, detail_level: str = 'standard') ->
     q_series = data.get('series', {}).get('quarterly', {})
     a_series = data.get('series', {}).get('annual', {})
     
-    def fmt(key, mult=1, dec=2, suf=''):
-        val = m.get(key)
-        return f"{float(val)*mult:.{dec}f}{suf}" if val is not None else 'N/A'
-    
     def get_trend(series_name, periods=4):
         """Get quarterly trend for a metric"""
         if series_name not in q_series or len(q_series[series_name]) < periods:
             return None
-        values = [item['v'] for item in q_series[series_name][:periods]]
-        return ' → '.join([f"{v:.2f}" for v in reversed(values)])
+        return _format_series(q_series[series_name], periods)
+    
+    fields = _LEVEL_FIELDS.get(detail_level, _DETAILED_FIELDS)
+    vals = {name: _format_metric(m.get(key), mult, dec, suf) for name, key, mult, dec, suf in fields}
     
     # === BRIEF LEVEL (~300 tokens) ===
     if detail_level == 'brief':
-        return f"""{symbol}: PE {fmt('peTTM')} (PEG {fmt('pegTTM')}), EPS ${fmt('epsTTM')} ({fmt('epsGrowthTTMYoy',100,1,'%')} YoY), ROE {fmt('roeTTM',100,1,'%')}, D/E {fmt('totalDebt/totalEquityQuarterly')}, YTD {fmt('yearToDatePriceReturnDaily',100,1,'%')}"""
+        return f"{symbol}: " + _BRIEF_TEMPLATE.format_map(vals)
     
     # === STANDARD LEVEL (~600 tokens) ===
-    sections = []
-    
-    # Core valuation
-    sections.append(f"VALUATION: PE {fmt('peTTM')} (Fwd {fmt('forwardPE')}), PEG {fmt('pegTTM')}, P/B {fmt('pb')}, P/S {fmt('psTTM')}, EV/EBITDA {fmt('evEbitdaTTM')}")
-    
-    # Profitability
-    sections.append(f"PROFITABILITY: EPS ${fmt('epsTTM')} ({fmt('epsGrowthTTMYoy',100,1,'%')} YoY), ROE {fmt('roeTTM',100,1,'%')}, ROA {fmt('roaTTM',100,1,'%')}, Net Margin {fmt('netProfitMarginTTM',100,1,'%')}, Op Margin {fmt('operatingMarginTTM',100,1,'%')}")
-    
-    # Growth
-    sections.append(f"GROWTH: Revenue {fmt('revenueGrowthTTMYoy',100,1,'%')} YoY, 3Y {fmt('revenueGrowth3Y',100,1,'%')}, 5Y {fmt('revenueGrowth5Y',100,1,'%')}, EPS 3Y {fmt('epsGrowth3Y',100,1,'%')}, 5Y {fmt('epsGrowth5Y',100,1,'%')}")
-    
-    # Financial health
-    sections.append(f"HEALTH: D/E {fmt('totalDebt/totalEquityQuarterly')}, Current {fmt('currentRatioQuarterly')}, Quick {fmt('quickRatioQuarterly')}, Cash/Share ${fmt('cashPerSharePerShareQuarterly')}")
-    
-    # Performance
-    sections.append(f"PERFORMANCE: YTD {fmt('yearToDatePriceReturnDaily',100,1,'%')}, 52W {fmt('52WeekPriceReturnDaily',100,1,'%')}, vs S&P {fmt('priceRelativeToS&P50052Week',100,1,'%')}, Beta {fmt('beta')}")
+    sections = [section.format_map(vals) for section in _STANDARD_SECTIONS]
     
     if detail_level == 'standard':
         return f"{symbol} Financial Summary:\n\n" + "\n\n".join(sections)
     
     # === DETAILED LEVEL (~1500 tokens) ===
     
-    # Add cash flow metrics
-    sections.append(f"CASH FLOW: FCF/Share ${fmt('cashFlowPerShareTTM')}, FCF Margin {fmt('focfCagr5Y',100,1,'%')} (5Y CAGR), P/FCF {fmt('pfcfShareTTM')}")
-    
-    # Add margins breakdown
-    sections.append(f"MARGINS: Gross {fmt('grossMarginTTM',100,1,'%')}, Operating {fmt('operatingMarginTTM',100,1,'%')}, Pretax {fmt('pretaxMarginTTM',100,1,'%')}, Net {fmt('netProfitMarginTTM',100,1,'%')}")
-    
-    # Add efficiency metrics
-    sections.append(f"EFFICIENCY: Asset Turnover {fmt('assetTurnoverTTM')}, Inventory Turnover {fmt('inventoryTurnoverTTM')}, Receivables Turnover {fmt('receivablesTurnoverTTM')}")
+    # Add cash flow, margins breakdown and efficiency metrics
+    sections.extend(section.format_map(vals) for section in _DETAILED_SECTIONS)
     
     # Add dividend info
     div_yield = m.get('currentDividendYieldTTM')
     if div_yield and div_yield > 0:
-        sections.append(f"DIVIDEND: Yield {fmt('currentDividendYieldTTM',100,2,'%')}, Payout Ratio {fmt('payoutRatioTTM',100,1,'%')}, DPS ${fmt('dividendPerShareTTM')}")
+        sections.append(_DIVIDEND_SECTION.format_map(vals))
     
     # Add price range
-    sections.append(f"PRICE RANGE: 52W High ${fmt('52WeekHigh')}, Low ${fmt('52WeekLow')}, Current P/B {fmt('pb')} vs Annual P/B {fmt('pbAnnual')}")
+    sections.append(_PRICE_RANGE_SECTION.format_map(vals))
     
     # Add quarterly trends
     trends = []
@@ -88,13 +159,40 @@ def create_comprehensive_summary(data: dict, detail_level: str = 'standard') ->
     
     # Add annual comparison
     if 'eps' in a_series and len(a_series['eps']) >= 3:
-        annual_eps = ' → '.join([f"{item['v']:.2f}" for item in reversed(a_series['eps'][:3])])
+        annual_eps = _format_series(a_series['eps'], 3)
         sections.append(f"ANNUAL EPS (3Y): {annual_eps}")
     
     return f"{symbol} Comprehensive Financial Analysis:\n\n" + "\n\n".join(sections)
 
 
 
+# Metric categories for `create_structured_compression` as
+# (name, key pattern, suffix pattern stripped from matching keys or None).
+# A key lands in every category whose pattern it matches.
+_STRUCTURED_CATEGORIES = (
+    ('valuation', re.compile(r'pe|pb|ps|peg|ev|pfcf|pcf'), re.compile(r'TTM|Annual|Quarterly')),
+    ('profitability', re.compile(r'eps|roe|roa|roi|margin|roic'), re.compile(r'TTM|Annual')),
+    ('growth', re.compile(r'Growth|Cagr'), None),
+    ('health', re.compile(r'Debt|Ratio|cash'), re.compile(r'Quarterly|Annual')),
+    ('performance', re.compile(r'Return|Week|(?i:beta)'), None),
+    ('efficiency', re.compile(r'Turnover|Employee'), None),
+    ('dividend', re.compile(r'dividend|payout', re.IGNORECASE), None),
+)
+
+
+@lru_cache(maxsize=1024)
+def _classify_metric(key: str) -> tuple:
+    """
+    Returns the (category, cleaned key) pairs a metric key is filed under. Finnhub
+    sends the same few hundred keys for every symbol, so each is matched only once.
+    """
+    return tuple(
+        (name, suffixes.sub('', key) if suffixes else key)
+        for name, pattern, suffixes in _STRUCTURED_CATEGORIES
+        if pattern.search(key)
+    )
+
+
 # Alternative: Preserve ALL data in structured format (minimal loss)
 def create_structured_compression(data: dict) -> dict:
     """
@@ -105,47 +203,16 @@ def create_structured_compression(data: dict) -> dict:
     q = data.get('series', {}).get('quarterly', {})
     a = data.get('series', {}).get('annual', {})
     
+    # Group related metrics in a single pass over the metric dict
+    buckets = {name: {} for name, _, _ in _STRUCTURED_CATEGORIES}
+    for k, v in m.items():
+        for name, clean_key in _classify_metric(k):
+            buckets[name][clean_key] = v
+    
     return {
         'symbol': data.get('symbol'),
         
-        # Group related metrics
-        'valuation': {
-            k.replace('TTM', '').replace('Annual', '').replace('Quarterly', ''): v 
-            for k, v in m.items() 
-            if any(x in k for x in ['pe', 'pb', 'ps', 'peg', 'ev', 'pfcf', 'pcf'])
-        },
-        
-        'profitability': {
-            k.replace('TTM', '').replace('Annual', ''): v 
-            for k, v in m.items() 
-            if any(x in k for x in ['eps', 'roe', 'roa', 'roi', 'margin', 'roic'])
-        },
-        
-        'growth': {
-            k: v for k, v in m.items() 
-            if 'Growth' in k or 'Cagr' in k
-        },
-        
-        'health': {
-            k.replace('Quarterly', '').replace('Annual', ''): v 
-            for k, v in m.items() 
-            if any(x in k for x in ['Debt', 'Ratio', 'cash'])
-        },
-        
-        'performance': {
-            k: v for k, v in m.items() 
-            if 'Return' in k or 'Week' in k or 'beta' in k.lower()
-        },
-        
-        'efficiency': {
-            k: v for k, v in m.items() 
-            if 'Turnover' in k or 'Employee' in k
-        },
-        
-        'dividend': {
-            k: v for k, v in m.items() 
-            if 'dividend' in k.lower() or 'payout' in k.lower()
-        },
+        **buckets,
         
         # Keep only recent trends (last 4 quarters)
         'trends_quarterly': {
@@ -1,126 +1,156 @@
 """Serves as the utility module for Finnhub and contains all the utility
 methods related to Finnhub."""
-import finnhub, datetime
+import asyncio, datetime
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp, orjson
+from cachetools import TTLCache
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 from typing import Optional
 from ..core.finnhub_config import FinnHubConfig
 from .log_util import setup_logger
+from .session_util import LoopBoundSession
 
 logger = setup_logger()
 
-class FinnHub(FinnHubConfig):
 
-    def __init__(self):
+class TransientFinnHubError(Exception):
+    "Raised for Finnhub responses which are worth retrying, e.g. rate limits."
+
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"Finnhub responded with HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+_TRANSIENT_ERRORS = (TransientFinnHubError, aiohttp.ClientConnectionError, asyncio.TimeoutError)
+_backoff = wait_exponential_jitter(initial=1, max=10)
+# Never sleep longer than the backoff ceiling, whatever Retry-After asks for
+_MAX_RETRY_AFTER = 10
+
+# Large payloads (e.g. basic financials) are parsed off the event loop on a small dedicated pool
+_OFFLOAD_PARSE_BYTES = 64 * 1024
+_PARSER_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='finnhub-json')
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    "Returns the Retry-After header in seconds, ignoring the HTTP-date form."
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _wait_for_retry(retry_state) -> float:
+    "Honour Retry-After when Finnhub sends it, otherwise back off exponentially with jitter."
+    error = retry_state.outcome.exception()
+    retry_after = getattr(error, 'retry_after', None)
+    return min(retry_after, _MAX_RETRY_AFTER) if retry_after is not None else _backoff(retry_state)
+
+
+class AsyncFinnHub(FinnHubConfig):
+    """Async Finnhub client which talks to the Finnhub REST API directly over
+    shared keep-alive sessions and caches the responses."""
+
+    BASE_URL = "https://finnhub.io/api/v1"
+
+    def __init__(self, cache_size: int = 1024, cache_ttl: int = 3600):
         super().__init__()
-        self.__finnhub_client = self.__get_finnhub_client()
+        self.__session = LoopBoundSession(self.__new_session)
+        self.__cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
 
-    def __get_finnhub_client(self):
+    def __new_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(resolver=aiohttp.AsyncResolver(), use_dns_cache=True,
+                                         ttl_dns_cache=600, limit=32, keepalive_timeout=60)
+        # The key goes in a header so it never ends up in URLs, errors or the logs
+        return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=20),
+                                     headers={'X-Finnhub-Token': self.finnhub_api_secret})
 
-        try:
-            return finnhub.Client(api_key=self.finnhub_api_secret)
-        except BaseException as e:
-            logger.error(msg=e)
-            raise BaseException('Auth failed for the Finnhub client.')
-    
-    def get_peers(self, company_symbol: str): 
+    async def close(self):
+        await self.__session.close()
+
+    async def __get(self, endpoint: str, **params):
+        "GET the endpoint, serving repeated (endpoint, params) lookups from the cache."
+        params = {key: value for key, value in params.items() if value is not None}
+        cache_key = (endpoint, tuple(sorted(params.items())))
+        if cache_key in self.__cache:
+            return self.__cache[cache_key]
+
+        async for attempt in AsyncRetrying(stop=stop_after_attempt(5),
+                                           wait=_wait_for_retry,
+                                           retry=retry_if_exception_type(_TRANSIENT_ERRORS),
+                                           reraise=True):
+            with attempt:
+                data = await self.__fetch(endpoint, params)
+
+        self.__cache[cache_key] = data
+        return data
+
+    async def __fetch(self, endpoint: str, params: dict):
+        session = await self.__session.get()
+        async with session.get(f"{self.BASE_URL}{endpoint}", params=params) as response:
+            if response.status in _RETRYABLE_STATUSES:
+                raise TransientFinnHubError(response.status,
+                                            _parse_retry_after(response.headers.get('Retry-After')))
+            response.raise_for_status()
+            raw = await response.read()
+
+        if len(raw) < _OFFLOAD_PARSE_BYTES:
+            return orjson.loads(raw)
+        return await asyncio.get_running_loop().run_in_executor(_PARSER_POOL, orjson.loads, raw)
+
+    async def get_peers(self, company_symbol: str):
         "Return list of peers operating in same niche."
-        try: 
-            peers_list = self.__finnhub_client.company_peers(symbol=company_symbol)
-            return peers_list
-        except Exception as e: 
+        try:
+            return await self.__get("/stock/peers", symbol=company_symbol)
+        except Exception as e:
             logger.error(msg=e)
             raise BaseException('Failed to get peers for the company.')
 
-    def get_company_news(self, company_symbol: str, begin_date: datetime, end_date: datetime):
-        try: 
+    async def get_peers_for_all(self, company_symbols: list):
+        "Return the peers of every given company, fetched concurrently."
+        peers_lists = await asyncio.gather(*[self.get_peers(company_symbol=symbol)
+                                             for symbol in company_symbols])
+        return dict(zip(company_symbols, peers_lists))
+
+    async def get_company_news(self, company_symbol: str, begin_date: datetime, end_date: datetime):
+        try:
             formatted_from_date = begin_date.strftime("%Y-%m-%d")
             formatted_to_date = end_date.strftime("%Y-%m-%d")
-            logger.info(f"""{
-                "start_date": {formatted_from_date},
-                "end_date": {formatted_to_date}
-            }""")
-            company_news = self.__finnhub_client.company_news(symbol=company_symbol, 
-                                                              _from=formatted_from_date, 
-                                                              to=formatted_to_date)
-            return company_news
-        except Exception as e: 
+            return await self.__get("/company-news", symbol=company_symbol,
+                                    **{"from": formatted_from_date, "to": formatted_to_date})
+        except Exception as e:
             logger.error(msg=e)
             raise BaseException("Failed to get company's news")
-        
-    def get_basic_financials(self, company_symbol: str, metric: str = None):
-        try: 
-            company_basic_financials = self.__finnhub_client.company_basic_financials(symbol=company_symbol,
-                                                                                      metric=metric)
-            return company_basic_financials
-        except Exception as e: 
+
+    async def get_basic_financials(self, company_symbol: str, metric: str = 'all'):
+        try:
+            return await self.__get("/stock/metric", symbol=company_symbol, metric=metric)
+        except Exception as e:
             logger.error(msg=e)
             raise BaseException('Failed to get financials for the company.')
 
-    def get_company_profile(self, company_symbol: str): 
-        try: 
-            company_profile = self.__finnhub_client.company_profile2(symbol=company_symbol)
-            return company_profile
+    async def get_company_profile(self, company_symbol: str):
+        try:
+            return await self.__get("/stock/profile2", symbol=company_symbol)
         except Exception as e:
-            logger.error(msg=e) 
+            logger.error(msg=e)
             raise BaseException('Failed to get company profile.')
 
-    def get_upcoming_ipos(self,begin_date: datetime, end_date: datetime = datetime.datetime.now()):
-        try: 
+    async def get_upcoming_ipos(self, begin_date: datetime, end_date: Optional[datetime] = None):
+        try:
+            end_date = end_date or datetime.datetime.now()
             formatted_from_date = begin_date.strftime("%Y-%m-%d")
             formatted_to_date = end_date.strftime("%Y-%m-%d")
-            upcoming_ipos = self.__finnhub_client.ipo_calendar(_from=formatted_from_date,
-                                                                to=formatted_to_date)
-            return upcoming_ipos
-        except Exception as e: 
-            logger.error(msg=e) 
+            return await self.__get("/calendar/ipo",
+                                    **{"from": formatted_from_date, "to": formatted_to_date})
+        except Exception as e:
+            logger.error(msg=e)
             raise BaseException('Failed to get upcoming ipos.')
-        
-    def get_historical_quartely_earnings(self, company_symbol: str, limit: int = None): 
-        try: 
-            earnings = None
-            if limit: 
-                earnings = self.__finnhub_client.company_earnings(symbol=company_symbol,
-                                                                  limit=limit)
-            else: 
-                earnings = self.__finnhub_client.company_earnings(symbol=company_symbol)
-
-            return earnings
-        except Exception as e: 
-            logger.error(msg=e) 
-            raise BaseException('Failed to get historical earning for company.')
 
-    # def get_visa_applications(self, company_symbol: str, begin_date: datetime, end_date: datetime):
-    #     try: 
-    #         formatted_from_date = begin_date.strftime("%Y-%m-%d")
-    #         formatted_to_date = end_date.strftime("%Y-%m-%d")
-    #         visa_application_details = self.__finnhub_client.stock_visa_application(symbol=company_symbol,
-    #                                                                                 _from=formatted_from_date,
-    #                                                                                 to=formatted_to_date)
-    #         # visa_application_details = self.__finnhub_client.stock_visa_application("AAPL", "2021-01-01", "2022-06-15")
-    #         return visa_application_details
-    #     except Exception as e:
-    #         logger.error(msg=e) 
-    #         raise BaseException('Failed to get visa applications.')
-        
-    # def get_reported_financials(self, company_symbol: str, frequency: str = None, access_number: str = None, begin_date: datetime = None, end_date: datetime = None): 
-    #     try: 
-    #         kwargs = {'symbol': company_symbol}
-
-    #         if frequency: 
-    #             kwargs['freq'] = frequency
-    #         else: 
-    #             kwargs['freq'] = 'annual'
-            
-    #         if access_number: 
-    #             kwargs['accessNumber'] = access_number
-
-    #         if begin_date and end_date: 
-    #             kwargs['_from'] = begin_date.strftime("%Y-%m-%d")
-    #             kwargs['to'] = end_date.strftime("%Y-%m-%d")
-
-    #         reported_financials = self.__finnhub_client.financials_reported(**kwargs)
-
-    #         return reported_financials
-
-    #     except Exception as e: 
-    #         logger.error(msg=e) 
-    #         raise BaseException('Failed to get financials.')
+    async def get_historical_quartely_earnings(self, company_symbol: str, limit: int = None):
+        try:
+            return await self.__get("/stock/earnings", symbol=company_symbol, limit=limit)
+        except Exception as e:
+            logger.error(msg=e)
+            raise BaseException('Failed to get historical earning for company.')
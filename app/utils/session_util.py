@@ -0,0 +1,57 @@
+"""Contains the shared aiohttp session handling used by the HTTP clients of the app."""
+import asyncio
+import atexit
+import weakref
+import aiohttp
+from typing import Callable
+
+# Every live LoopBoundSession, so they can all be closed on shutdown
+_HOLDERS = weakref.WeakSet()
+
+
+class LoopBoundSession:
+    """
+    Lazily creates one keep-alive `aiohttp.ClientSession` per running event loop.
+    A session cannot outlive its loop and must only be used or closed from it, so
+    each loop (e.g. one per thread, or successive `asyncio.run` calls) gets its own.
+    """
+
+    def __init__(self, factory: Callable[[], aiohttp.ClientSession]):
+        self.__factory = factory
+        self.__sessions = weakref.WeakKeyDictionary()
+        _HOLDERS.add(self)
+
+    async def get(self) -> aiohttp.ClientSession:
+        "Returns the session of the running loop, creating it on first use."
+        loop = asyncio.get_running_loop()
+        session = self.__sessions.get(loop)
+        if session is None or session.closed:
+            session = self.__sessions[loop] = self.__factory()
+        return session
+
+    async def close(self):
+        "Closes the session of the running loop, sessions of other loops are left alone."
+        session = self.__sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def close_at_exit(self):
+        "Closes the sessions whose loop is still open and idle."
+        for loop, session in list(self.__sessions.items()):
+            if not session.closed and not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(self.close())
+
+
+async def close_sessions():
+    """
+    Closes the shared sessions of the running loop, to be awaited on application
+    shutdown. `asyncio.run` closes its loop on return, so await this at the end of
+    the coroutine passed to it, else the sessions are left unclosed.
+    """
+    await asyncio.gather(*[holder.close() for holder in list(_HOLDERS)])
+
+
+@atexit.register
+def _close_sessions_at_exit():
+    for holder in list(_HOLDERS):
+        holder.close_at_exit()
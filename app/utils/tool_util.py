@@ -0,0 +1,70 @@
+"""Contains the helper to expose async functions as LangChain tools usable from sync code too."""
+import asyncio
+import atexit
+import functools
+import threading
+from typing import Callable, Optional
+from langchain_core.tools import StructuredTool
+from .session_util import close_sessions
+
+
+class _BackgroundLoop:
+    """
+    One event loop running on a daemon thread, shared by the sync fallbacks of the
+    tools. Running every sync call on it keeps the shared sessions (and their
+    keep-alive connections) on a single loop, whatever thread `.invoke` comes from,
+    and it works even when the calling thread already runs an event loop.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__thread: Optional[threading.Thread] = None
+
+    def run(self, coroutine):
+        "Runs the coroutine on the background loop and blocks until its result."
+        return asyncio.run_coroutine_threadsafe(coroutine, self.__get_loop()).result()
+
+    def __get_loop(self) -> asyncio.AbstractEventLoop:
+        with self.__lock:
+            if self.__loop is None:
+                self.__loop = asyncio.new_event_loop()
+                self.__thread = threading.Thread(target=self.__loop.run_forever,
+                                                 name='async-tools', daemon=True)
+                self.__thread.start()
+            return self.__loop
+
+    def stop(self, timeout: float = 5):
+        "Closes the sessions opened on the loop, then stops and closes it."
+        with self.__lock:
+            loop, thread, self.__loop, self.__thread = self.__loop, self.__thread, None, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(close_sessions(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not loop.is_running():
+                loop.close()
+
+
+_BACKGROUND_LOOP = _BackgroundLoop()
+atexit.register(_BACKGROUND_LOOP.stop)
+
+
+def async_tool(coroutine: Optional[Callable] = None, *, name: Optional[str] = None):
+    """
+    Like `@tool` for coroutines, but the tool also keeps working with the sync `.invoke`,
+    which runs the coroutine on the shared background loop. Use as `@async_tool` or
+    `@async_tool(name=...)`.
+    """
+    def decorator(coroutine: Callable) -> StructuredTool:
+
+        @functools.wraps(coroutine)
+        def func(*args, **kwargs):
+            return _BACKGROUND_LOOP.run(coroutine(*args, **kwargs))
+
+        return StructuredTool.from_function(func=func, coroutine=coroutine, name=name)
+
+    return decorator(coroutine) if coroutine is not None else decorator